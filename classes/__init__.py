@@ -4,5 +4,9 @@ from .character import Character
 from .resource import Resource
 from .event import Event
 from .game import Game
+from .tracer import Tracer
+from .results import ResultStore
+from .profiler import Profiler
+from .sketch import OutcomeStats
 
-__all__ = ['Character', 'Resource', 'Event', 'Game']
\ No newline at end of file
+__all__ = ['Character', 'Resource', 'Event', 'Game', 'Tracer', 'ResultStore', 'Profiler', 'OutcomeStats']
\ No newline at end of file
@@ -11,6 +11,8 @@ class Event:
         Initializes an event with a specific event type.
         """
         self.event_type = event_type
+        self.last_outcome = None
+        self.policy = None
 
     def process_event(self, character, resources, success_rate):
         """
@@ -18,6 +20,18 @@ class Event:
         """
         raise NotImplementedError("Subclasses must implement this method.")
 
+    def ask(self, prompt, resources):
+        """
+        Asks the player a yes/no question, or lets the decision policy answer it during auto-play.
+
+        :param prompt: The question shown to the player.
+        :param resources: The character's resources, which the policy may consider.
+        :return: The answer, 'y' or 'n' when valid.
+        """
+        if self.policy is None:
+            return input(prompt).strip().lower()
+        return self.policy(self.event_type, resources)
+
     def calculate_success_rate(self):
         """
         Calculates the success rate of the event.
@@ -41,6 +55,7 @@ class AmmoBoxEvent(Event):
         
         # Adds the found ammo to the character's resources
         resources.add_ammo(ammo_found)
+        self.last_outcome = 'found'
         
         print(f"\nYou found an ammo box! Gained {ammo_found} ammo.")
         return True
@@ -60,17 +75,19 @@ class WeaselEvent(Event):
         print("\nYou have encountered a weasel!")
 
         while True:
-            flee_choice = input("\nDo you wish to try to flee? (y/n): ").strip().lower()
+            flee_choice = self.ask("\nDo you wish to try to flee? (y/n): ", resources)
             
             if flee_choice == 'y':
                 # 50/50 chance to flee successfully
                 if random.random() < 0.5:
                     print("You successfully fled from the weasel!")
+                    self.last_outcome = 'fled'
                     return True
                 else:
                     stolen_food = random.randint(1, 3)
                     print(f"You failed to flee. The weasel stole {stolen_food} food!")
                     resources.food -= stolen_food
+                    self.last_outcome = 'flee_failed'
                     return True
             elif flee_choice == 'n':
                 # Player chooses to fight the weasel
@@ -80,12 +97,14 @@ class WeaselEvent(Event):
                     resources.ammo -= 1
                     resources.food += 1
                     print("You lose 1 ammo and found 1 food.")
+                    self.last_outcome = 'fought_won'
                 else:
                     stolen_food = random.randint(1, 3)
                     print(f"You missed the weasel! It stole {stolen_food} food.")
                     resources.ammo -= 1
                     resources.food -= stolen_food
                     print("You lose 1 ammo and food.")
+                    self.last_outcome = 'fought_lost'
                 return True
             else:
                 print("Invalid input. Please enter 'y' or 'n'.")
@@ -104,22 +123,25 @@ class TravelerEvent(Event):
         """
         while True:
             print("\nYou find a traveler and you are unsure of his intentions")
-            shoot_choice = input("Do you want to shoot the traveler? (y/n): ").strip().lower()
+            shoot_choice = self.ask("Do you want to shoot the traveler? (y/n): ", resources)
 
             if shoot_choice == 'y':
                 # 50/50 chance to kill the traveler
                 if random.random() < 0.5:
                     print("You successfully shot the traveler!")
                     resources.health = 10
+                    self.last_outcome = 'shot_hit'
                     return True
                 else:
                     print("You missed the shot. The traveler retaliates!")
                     if random.random() < 0.5:
                         print("The traveler hits you. You lose 3 health.")
                         resources.health -= 3
+                        self.last_outcome = 'shot_missed_hit'
                     else:
                         print("The traveler misses you. You lose 3 food.")
                         resources.food = max(0, resources.food - 3)
+                        self.last_outcome = 'shot_missed_spared'
                     return True
             
             elif shoot_choice == 'n':
@@ -127,14 +149,17 @@ class TravelerEvent(Event):
                 if random.random() < 0.5:
                     print("The traveler is good and lets you stay at his camp. Your health is restored to 10.")
                     resources.health = 10
+                    self.last_outcome = 'good_traveler'
                 else:
                     print("The traveler is bad. He tries to shoot you!")
                     if random.random() < 0.5:
                         print("The traveler hits you. You lose 4 health.")
                         resources.health -= 4
+                        self.last_outcome = 'bad_traveler_hit'
                     else:
                         print("The traveler misses you. You lose 3 food.")
                         resources.food = max(0, resources.food - 3)
+                        self.last_outcome = 'bad_traveler_missed'
                     
                     # 50/50 chance to hit the traveler
                     if random.random() < 0.5:
@@ -143,12 +168,15 @@ class TravelerEvent(Event):
                             ammo_found = random.randint(2, 3)
                             resources.add_ammo(ammo_found)
                             print(f"Gained {ammo_found} ammo.")
+                            self.last_outcome += ':looted_ammo'
                         else:
                             food_found = random.randint(2, 3)
                             resources.add_food(food_found)
                             print(f"Gained {food_found} food.")
+                            self.last_outcome += ':looted_food'
                     else:
                         print("You miss the traveler. No extra supplies gained.")
+                        self.last_outcome += ':missed'
                 return True
             
             else:
@@ -168,17 +196,19 @@ class SnakeBiteEvent(Event):
         print("\nYou have encountered a snake!")
 
         while True:
-            flee_choice = input("\nDo you wish to try to flee? (y/n): ").strip().lower()
+            flee_choice = self.ask("\nDo you wish to try to flee? (y/n): ", resources)
             
             if flee_choice == 'y':
                 # 50/50 chance to flee successfully
                 if random.random() < 0.5:
                     print("You successfully fled from the snake!")
+                    self.last_outcome = 'fled'
                     return True
                 else:
                     print("You failed to flee. The snake bites you!")
                     resources.health -= 2
                     print("You lose 2 health.")
+                    self.last_outcome = 'flee_failed'
                     return True
             elif flee_choice == 'n':
                 # Player chooses to fight the snake
@@ -188,11 +218,13 @@ class SnakeBiteEvent(Event):
                     resources.ammo -= 1
                     resources.food += 1
                     print("You lose 1 ammo and found 1 food")
+                    self.last_outcome = 'fought_won'
                 else:
                     print("You missed the snake!")
                     resources.ammo -= 1
                     resources.health -= 2
                     print("You lose 1 ammo and 2 health.")
+                    self.last_outcome = 'fought_lost'
                 return True
             else:
                 print("Invalid input. Please enter 'yes' or 'no'.")
@@ -214,6 +246,7 @@ class ChestOfFoodEvent(Event):
         
         # Add the found food to the character's resources
         resources.add_food(food_found)
+        self.last_outcome = 'found'
         
         print(f"\nYou found a chest of food! Gained {food_found} food.")
         return True
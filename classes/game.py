@@ -1,21 +1,36 @@
 # classes/game.py
 
 from .event import SnakeBiteEvent, ChestOfFoodEvent, AmmoBoxEvent, WeaselEvent, TravelerEvent
+import contextlib
 import json
+import os
+import sys
 from .character import Character
 from .resource import Resource
+from .policy import POLICIES
 import random
 
 class Game:
-    def __init__(self):
+    def __init__(self, tracer=None, stats=None, results=None, seed=None):
         """
         Initializes a new game instance.
+
+        :param tracer: An optional Tracer recording spans for each round and event.
+        :param stats: An optional OutcomeStats collecting event and end-of-game statistics.
+        :param results: An optional ResultStore that each finished game is appended to.
+        :param seed: The random seed for this game, recorded with its result. A new seed
+                     is drawn if none is given.
         """
+        self.tracer = tracer
+        self.stats = stats
+        self.results = results
+        self._seed_game(seed)
         self.character = None
         self.resources = None
         self.events = [AmmoBoxEvent(), WeaselEvent(), TravelerEvent(), SnakeBiteEvent(), ChestOfFoodEvent()]
         self.game_state = {}
         self.event_count = 0
+        self.event_counts = {}
         self.roles = {
             '1': 'Sharpshooter',
             '2': 'Explorer',
@@ -257,6 +272,10 @@ class Game:
         Handles the game over scenario when the character's food or health reaches 0.
         """
         
+        if self.tracer is not None:
+            self.tracer.dump_ring('game_over')
+        self._record_result()
+
         print("\nGame Over!")
         print("Your character has run out of food or health.")
         self.show_character()
@@ -264,7 +283,7 @@ class Game:
 
         restart = input("\nWould you like to play again? (yes/no): ").strip().lower()
         if restart == 'yes':
-            self.__init__()  # Reinitialize the game
+            self.__init__(tracer=self.tracer, stats=self.stats, results=self.results)  # Reinitialize the game
             self.start_game()
         else:
             print("Thank you for playing! Goodbye!")
@@ -274,6 +293,8 @@ class Game:
         """
         Handles the end of the game scenario when the player reaches round 30.
         """
+        self._record_result()
+
         print("\nCongratulations! You've reached your destination and are soon to be called home.")
         print("You have successfully completed your journey.")
         print(f"\nSummary:")
@@ -289,60 +310,201 @@ class Game:
         exit()
         
 
+    def outcome(self):
+        """
+        Describes how the current game stands or ended.
+
+        :return: 'food' or 'health' if the character ran out of it, 'completed' if the
+                 journey is finished, or 'unfinished' otherwise.
+        """
+        resources = self.character.resources
+        if resources.food <= 0:
+            return 'food'
+        if resources.health <= 0:
+            return 'health'
+        if self.event_count >= 30:
+            return 'completed'
+        return 'unfinished'
+
+    def _seed_game(self, seed=None):
+        """
+        Seeds the random events of a new game, so the game can be replayed from its seed.
+
+        :param seed: The seed to use, or None to draw one from the current random state.
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.policy = 'manual'
+        random.seed(self.seed)
+
+    def _record_result(self):
+        """
+        Reports the finished game to the outcome statistics and result store, if any.
+        """
+        if self.stats is not None:
+            self.stats.update_game(self)
+        if self.results is not None:
+            self.results.append_game(self, seed=self.seed, policy=self.policy)
+
     def apply_random_event(self):
         """
         Applies a random event to the character and updates the game state.
         """
         if self.character:
-            # Check if the game is over before processing any event
-            if self.character.resources.food <= 0 or self.character.resources.health <= 0:
+            self.policy = 'manual'
+            status = self._run_round()
+
+            if status == 'game_over':
                 self.game_over()
-                return
+            elif status == 'completed':
+                self.end_game()
+            else:
+                # Show character and resources after the event
+                self.show_character()
+                self.show_resources()
+        else:
+            print("No character has been created yet.")
 
-            # 33% chance to lose one food per round
-            if random.random() < 0.33:
-                self.character.resources.food = max(0, self.character.resources.food - 1)
-                print("\nYou feel a bit hungry and lose 1 food.")
-                
-                # Check for game over immediately after reducing food
-                if self.character.resources.food <= 0:
-                    self.game_over()
-                    return
+    def auto_play(self, rounds=None, policy='cautious'):
+        """
+        Plays rounds without prompting, letting a decision policy answer every event.
 
-            # Check again if the game is over before applying a new event
-            if self.character.resources.food <= 0 or self.character.resources.health <= 0:
-                self.game_over()
-                return
+        Output from the rounds is hidden. Instead a progress line is updated after each
+        round, followed by a one-line summary. If the game ends, the usual game over or
+        end of journey screen follows.
 
-            # Process an event if the game is not over
-            if self.event_count >= 30:
-                self.end_game()
-                return
-            
-            event = random.choice(self.events)
+        :param rounds: The number of rounds to play, or None to play until the game ends.
+        :param policy: The name of a decision policy in POLICIES.
+        """
+        if not self.character:
+            print("No character has been created yet.")
+            return
+
+        decide = POLICIES[policy]
+        self.policy = policy
+        for event in self.events:
+            event.policy = decide
+
+        resources = self.character.resources
+        total = rounds if rounds is not None else max(30 - self.event_count, 0)
+        progress = sys.stdout
+        print()
 
-            # Apply role-specific abilities
+        played = 0
+        status = 'continue'
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                while rounds is None or played < rounds:
+                    status = self._run_round()
+                    if status != 'continue':
+                        break
+                    played += 1
+                    progress.write(f"\rAuto-playing: {played}/{total} rounds, Food {resources.food}, "
+                                   f"Ammo {resources.ammo}, Health {resources.health}   ")
+                    progress.flush()
+        finally:
+            for event in self.events:
+                event.policy = None
+
+        print(f"\rAuto-played {played} rounds ({policy}): Round {self.event_count}, "
+              f"Food {resources.food}, Ammo {resources.ammo}, Health {resources.health}   ")
+
+        if status == 'game_over':
+            self.game_over()
+        elif status == 'completed':
+            self.end_game()
+        else:
+            self.show_character()
+            self.show_resources()
+
+    def _run_round(self):
+        """
+        Plays a single round, inside a span when tracing.
+
+        :return: The status returned by _play_round.
+        """
+        if self.tracer is None:
+            return self._play_round()
+
+        with self.tracer.span('apply_random_event', round=self.event_count) as span:
+            status = self._play_round()
+            span['status'] = status
+        return status
+
+    def _play_round(self):
+        """
+        Plays a single round: hunger, a random event and ability unlocks.
+
+        :return: 'game_over' if the character ran out of food or health, 'completed' if the
+                 journey is finished, or 'continue' otherwise.
+        """
+        # Check if the game is over before processing any event
+        if self.character.resources.food <= 0 or self.character.resources.health <= 0:
+            return 'game_over'
+
+        # 33% chance to lose one food per round
+        if random.random() < 0.33:
+            self.character.resources.food = max(0, self.character.resources.food - 1)
+            print("\nYou feel a bit hungry and lose 1 food.")
+
+            # Check for game over immediately after reducing food
+            if self.character.resources.food <= 0:
+                return 'game_over'
+
+        # Process an event if the game is not over
+        if self.event_count >= 30:
+            return 'completed'
+
+        event = random.choice(self.events)
+
+        # Apply role-specific abilities and process the event
+        if self.tracer is None and self.stats is None:
             success_rate = event.calculate_success_rate()
             success_rate = self.character.apply_role_ability(event.event_type, success_rate)
+            event.process_event(self.character, self.character.resources, success_rate)
+        else:
+            self._observed_process_event(event)
+        self.event_counts[event.event_type] = self.event_counts.get(event.event_type, 0) + 1
 
-            # Process the event
-            result = event.process_event(self.character, self.character.resources, success_rate)
+        # Check for game over after processing the event
+        if self.character.resources.food <= 0 or self.character.resources.health <= 0:
+            return 'game_over'
 
-            # Check for game over after processing the event
-            if self.character.resources.food <= 0 or self.character.resources.health <= 0:
-                self.game_over()
-                return
+        self.event_count += 1
+        self.character.unlock_ability(self.event_count)
+        return 'continue'
 
-            self.event_count += 1
-            self.character.unlock_ability(self.event_count)
-            
-            # Show character and resources after the event
-            self.show_character()
-            self.show_resources()
+    def _observed_process_event(self, event):
+        """
+        Processes an event, reporting its outcome and effect on resources to the tracer and stats.
+
+        :param event: The event to process.
+        """
+        resources = self.character.resources
+        if self.tracer is not None:
+            span_context = self.tracer.span('process_event', event_type=event.event_type)
         else:
-            print("No character has been created yet.")
-            
-        
+            span_context = contextlib.nullcontext({})
+
+        with span_context as span:
+            base_rate = event.calculate_success_rate()
+            success_rate = self.character.apply_role_ability(event.event_type, base_rate)
+            before = (resources.food, resources.ammo, resources.health)
+
+            event.last_outcome = None
+            event.process_event(self.character, resources, success_rate)
+
+            span['branch'] = event.last_outcome
+            span['ability_modifier'] = success_rate - base_rate
+            deltas = {
+                'food': resources.food - before[0],
+                'ammo': resources.ammo - before[1],
+                'health': resources.health - before[2],
+            }
+            span['deltas'] = deltas
+
+        if self.stats is not None:
+            self.stats.update_event(event.event_type, event.last_outcome, deltas)
+
     def restart(self):
         """
         Restarts the game by resetting character and resources, and resetting the event count.
@@ -353,6 +515,8 @@ class Game:
         self.character = None
         self.resources = None
         self.event_count = 0
+        self.event_counts = {}
+        self._seed_game()
 
         print("\nThe game has been reset.")
         
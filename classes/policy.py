@@ -0,0 +1,45 @@
+# classes/policy.py
+
+import random
+
+# Decision policies answer the yes/no question an event asks during auto-play.
+# The weasel and snake ask "Do you wish to try to flee?" and the traveler asks
+# "Do you want to shoot the traveler?".
+
+def cautious(event_type, resources):
+    """
+    Always flees from animals and never shoots the traveler.
+    """
+    return 'n' if event_type == 'traveler' else 'y'
+
+
+def aggressive(event_type, resources):
+    """
+    Always fights animals and always shoots the traveler.
+    """
+    return 'y' if event_type == 'traveler' else 'n'
+
+
+def balanced(event_type, resources):
+    """
+    Fights only while there is ammo to spare and health to risk, and flees otherwise.
+    """
+    fight = resources.ammo > 0 and resources.health > 4
+    if event_type == 'traveler':
+        return 'y' if fight else 'n'
+    return 'n' if fight else 'y'
+
+
+def random_choice(event_type, resources):
+    """
+    Answers every question at random.
+    """
+    return random.choice(['y', 'n'])
+
+
+POLICIES = {
+    'cautious': cautious,
+    'aggressive': aggressive,
+    'balanced': balanced,
+    'random': random_choice,
+}
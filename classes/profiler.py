@@ -0,0 +1,120 @@
+# classes/profiler.py
+
+import os
+import sys
+import time
+
+
+class Profiler:
+    """
+    A deterministic profiler that only follows functions in the game's modules.
+
+    Time spent outside those modules (printing, waiting on input, the standard
+    library) is charged to the innermost game function that called it. CPU time is
+    measured, so time spent waiting for the player to type is not counted.
+    """
+    MODULES = ('game.py', 'event.py', 'character.py')
+
+    def __init__(self, modules=MODULES):
+        """
+        Initializes the profiler.
+
+        :param modules: The file names, within the classes package, of the modules to profile.
+        """
+        package = os.path.dirname(os.path.abspath(__file__))
+        self.files = {os.path.join(package, module) for module in modules}
+        self.stacks = {}
+        self.calls = {}
+        self._stack = []
+        self._frames = []
+        self._last = None
+
+    def start(self):
+        """
+        Starts profiling the current thread.
+        """
+        self._last = time.process_time()
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        """
+        Stops profiling.
+        """
+        sys.setprofile(None)
+        self._charge(time.process_time())
+        self._stack = []
+        self._frames = []
+
+    def _charge(self, now):
+        """
+        Adds the time since the last profiler event to the current stack.
+        """
+        if self._stack:
+            key = tuple(self._stack)
+            self.stacks[key] = self.stacks.get(key, 0) + now - self._last
+        self._last = now
+
+    def _profile(self, frame, event, arg):
+        """
+        Tracks calls into and returns from the profiled modules. Installed with sys.setprofile.
+
+        :param frame: The frame being called or returned from.
+        :param event: The kind of event, such as 'call' or 'return'.
+        :param arg: The return value or C function, which is not used.
+        """
+        if event == 'call':
+            code = frame.f_code
+            if code.co_filename in self.files:
+                self._charge(time.process_time())
+                module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                name = f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+                self._stack.append(name)
+                self._frames.append(frame)
+                self.calls[name] = self.calls.get(name, 0) + 1
+        elif event == 'return':
+            if self._frames and self._frames[-1] is frame:
+                self._charge(time.process_time())
+                self._stack.pop()
+                self._frames.pop()
+
+    def write_collapsed(self, path):
+        """
+        Writes the recorded stacks in the collapsed format read by flamegraph tools.
+
+        Each line holds a semicolon-separated stack and its self time in microseconds.
+
+        :param path: The file to write.
+        """
+        with open(path, 'w') as file:
+            for stack, seconds in sorted(self.stacks.items()):
+                file.write(f"{';'.join(stack)} {round(seconds * 1_000_000)}\n")
+
+    def hotspots(self):
+        """
+        Totals the recorded time for each function.
+
+        :return: A list of (function, calls, self seconds, total seconds), slowest total first.
+        """
+        own = {}
+        total = {}
+        for stack, seconds in self.stacks.items():
+            own[stack[-1]] = own.get(stack[-1], 0) + seconds
+            # A recursive function is only counted once per stack
+            for name in set(stack):
+                total[name] = total.get(name, 0) + seconds
+
+        rows = [(name, self.calls.get(name, 0), own.get(name, 0), seconds) for name, seconds in total.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def print_hotspots(self, limit=10):
+        """
+        Prints a table of the functions with the most total time.
+
+        :param limit: The number of functions to show.
+        """
+        print("\nProfile Hotspots")
+        print(f"{'='*72}")
+        print(f"{'Function':<40}{'Calls':>8}{'Self ms':>12}{'Total ms':>12}")
+        for name, calls, own, total in self.hotspots()[:limit]:
+            print(f"{name:<40}{calls:>8}{own * 1000:>12.2f}{total * 1000:>12.2f}")
+        print(f"{'='*72}")
@@ -0,0 +1,373 @@
+# classes/results.py
+
+import contextlib
+import mmap
+import os
+import struct
+
+from .policy import POLICIES
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ResultStore:
+    """
+    Stores per-game results as fixed-width binary column files.
+
+    Each column lives in its own file inside the store directory and is read back
+    as a memory-mapped view, so queries never load the whole store into memory.
+    Text fields (role, policy, cause) are stored as one-byte codes: the position of
+    the label in LABELS. New labels must only ever be added to the end of those lists.
+
+    Several processes may append to the same store. Each row is written while
+    holding a lock on the directory, on systems that support fcntl locks; elsewhere
+    only one process may write to a store at a time.
+
+    When NumPy is installed, columns are NumPy arrays and queries run vectorised,
+    one chunk of rows at a time. Without it the same queries loop in Python, which
+    is only practical for a few million rows.
+    """
+    EVENT_TYPES = ['ammo_box', 'weasel', 'traveler', 'snakebite', 'chest_of_food']
+
+    COLUMNS = {
+        'seed': 'q',
+        'role': 'B',
+        'policy': 'B',
+        'food': 'i',
+        'ammo': 'i',
+        'health': 'i',
+        'rounds': 'i',
+        'cause': 'B',
+    }
+    COLUMNS.update({f'events_{event_type}': 'i' for event_type in EVENT_TYPES})
+
+    LABELS = {
+        'role': ['Sharpshooter', 'Explorer', 'Pacifist', 'Unknown'],
+        'policy': ['manual'] + list(POLICIES),
+        'cause': ['food', 'health', 'completed', 'unfinished'],
+    }
+    CATEGORIES = list(LABELS)
+
+    CHUNK_ROWS = 1 << 22
+
+    def __init__(self, path):
+        """
+        Opens the store in the given directory, creating it if needed.
+
+        :param path: The directory holding the column files.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        # Unbuffered, so a whole row reaches the files before the lock is released
+        self._writers = {name: open(self._column_path(name), 'ab', buffering=0) for name in self.COLUMNS}
+        self._maps = {}
+        with self._locked():
+            self._repair()
+
+    def _column_path(self, name):
+        """
+        Returns the path of the file holding a column.
+
+        :param name: The column name.
+        """
+        return os.path.join(self.path, f'{name}.col')
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Holds an exclusive lock on the store directory while rows are written.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.path, 'store.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _repair(self):
+        """
+        Truncates every column to the shortest one, dropping a partial row left by a
+        process that was killed while writing. Must be called while holding the lock.
+        """
+        rows = len(self)
+        for name, fmt in self.COLUMNS.items():
+            size = rows * struct.calcsize(fmt)
+            if os.path.getsize(self._column_path(name)) > size:
+                os.truncate(self._column_path(name), size)
+
+    def append(self, record):
+        """
+        Appends one game's results to the store.
+
+        Every column is packed before anything is written, so a bad value raises
+        ValueError without leaving the columns misaligned.
+
+        :param record: A dictionary with a value for every column. Role, policy and
+                       cause are given as text from LABELS; missing event counts
+                       default to 0.
+        """
+        packed = {}
+        for name, fmt in self.COLUMNS.items():
+            value = record.get(name, 0)
+            if name in self.CATEGORIES:
+                if value not in self.LABELS[name]:
+                    raise ValueError(f"Unknown {name} '{value}'.")
+                value = self.LABELS[name].index(value)
+            try:
+                packed[name] = struct.pack(fmt, value)
+            except struct.error as error:
+                raise ValueError(f"Invalid value for '{name}': {value!r}") from error
+
+        with self._locked():
+            self._repair()
+            for name, data in packed.items():
+                self._writers[name].write(data)
+
+    def append_game(self, game, seed=0, policy='manual'):
+        """
+        Appends the results of a finished or abandoned game.
+
+        :param game: The Game instance to record.
+        :param seed: The random seed the game was played with.
+        :param policy: The name of the decision policy that last auto-played the game,
+                       or 'manual'.
+        """
+        resources = game.character.resources
+        role = game.character.role if game.character.role in self.LABELS['role'] else 'Unknown'
+        record = {
+            'seed': seed,
+            'role': role,
+            'policy': policy,
+            'food': resources.food,
+            'ammo': resources.ammo,
+            'health': resources.health,
+            'rounds': game.event_count,
+            'cause': game.outcome(),
+        }
+        for event_type, count in game.event_counts.items():
+            record[f'events_{event_type}'] = count
+        self.append(record)
+
+    def __len__(self):
+        return min(os.path.getsize(self._column_path(name)) // struct.calcsize(fmt)
+                   for name, fmt in self.COLUMNS.items())
+
+    def column(self, name):
+        """
+        Returns a column as a zero-copy memory-mapped view.
+
+        :param name: The column name.
+        :return: A NumPy array over the column file when NumPy is installed, or a
+                 memoryview otherwise. Text columns hold codes; see LABELS.
+        """
+        fmt = self.COLUMNS[name]
+        rows = len(self)
+        size = rows * struct.calcsize(fmt)
+        if size == 0:
+            return numpy.zeros(0, dtype=fmt) if numpy is not None else memoryview(b'').cast(fmt)
+
+        cached = self._maps.get(name)
+        if cached is None or len(cached) < size:
+            if cached is not None:
+                self._close_map(cached)
+            with open(self._column_path(name), 'rb') as file:
+                cached = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[name] = cached
+        if numpy is not None:
+            return numpy.frombuffer(cached, dtype=fmt, count=rows)
+        return memoryview(cached)[:size].cast(fmt)
+
+    def _tests(self, conditions):
+        """
+        Converts query conditions to (column, expected) pairs, turning labels into codes.
+
+        :return: The pairs, or None if a condition asks for a label that was never stored.
+        """
+        tests = []
+        for name, expected in conditions.items():
+            if name in self.CATEGORIES and not callable(expected):
+                if expected not in self.LABELS[name]:
+                    return None
+                expected = self.LABELS[name].index(expected)
+            tests.append((self.column(name), expected))
+        return tests
+
+    def _chunks(self):
+        """
+        Yields (start, stop) bounds that split the store into chunks for NumPy queries.
+        """
+        rows = len(self)
+        for start in range(0, rows, self.CHUNK_ROWS):
+            yield start, min(start + self.CHUNK_ROWS, rows)
+
+    def _mask(self, tests, start, stop):
+        """
+        Returns a boolean array of the rows between start and stop that pass every test.
+        """
+        mask = numpy.ones(stop - start, dtype=bool)
+        for values, expected in tests:
+            chunk = values[start:stop]
+            mask &= expected(chunk) if callable(expected) else chunk == expected
+        return mask
+
+    def select(self, **conditions):
+        """
+        Finds the index of every row matching all the given conditions.
+
+        :param conditions: Column names mapped to a value to compare against, or to a
+                           function returning True for values to keep. Text columns are
+                           compared by label. With NumPy installed, functions are given
+                           arrays of values and must return boolean arrays, which the
+                           usual comparisons such as lambda food: food > 0 already do.
+        :return: A NumPy array of row indices when NumPy is installed, or an iterator
+                 of row indices otherwise.
+        """
+        tests = self._tests(conditions)
+        if numpy is not None:
+            if tests is None:
+                return numpy.zeros(0, dtype=numpy.int64)
+            found = [numpy.flatnonzero(self._mask(tests, start, stop)) + start
+                     for start, stop in self._chunks()]
+            return numpy.concatenate(found) if found else numpy.zeros(0, dtype=numpy.int64)
+
+        if tests is None:
+            return iter(())
+        return (row for row in range(len(self))
+                if all(expected(values[row]) if callable(expected) else values[row] == expected
+                       for values, expected in tests))
+
+    def count_by(self, by, **conditions):
+        """
+        Counts rows in each group, optionally restricted to rows matching conditions.
+
+        :param by: A list of column names to group by.
+        :param conditions: Row conditions, as accepted by select.
+        :return: A dictionary mapping each group's key tuple to its row count.
+        """
+        return {key: total for key, (total, _) in self._groups(by, conditions).items()}
+
+    def survival_rate(self, by=('role', 'policy'), **conditions):
+        """
+        Computes the share of games that reached the end of the journey in each group.
+
+        :param by: A list of column names to group by.
+        :param conditions: Row conditions, as accepted by select.
+        :return: A dictionary mapping each group's key tuple to its survival rate.
+        """
+        return {key: survived / total for key, (total, survived) in self._groups(by, conditions).items()}
+
+    def _groups(self, by, conditions):
+        """
+        Tallies the total and surviving games for every group, decoding text labels.
+        """
+        completed = self.LABELS['cause'].index('completed')
+        tests = self._tests(conditions)
+        if tests is None:
+            return {}
+
+        if numpy is not None:
+            return self._groups_numpy(by, tests, completed)
+
+        keys = [self.column(name) for name in by]
+        causes = self.column('cause')
+        rows = self.select(**conditions) if conditions else range(len(self))
+
+        groups = {}
+        for row in rows:
+            key = tuple(values[row] for values in keys)
+            total, survived = groups.get(key, (0, 0))
+            groups[key] = (total + 1, survived + (causes[row] == completed))
+
+        decoded = {}
+        for key, tally in groups.items():
+            key = tuple(self.LABELS[name][value] if name in self.CATEGORIES else value
+                        for name, value in zip(by, key))
+            decoded[key] = tally
+        return decoded
+
+    def _groups_numpy(self, by, tests, completed):
+        """
+        Tallies groups one chunk at a time with vectorised NumPy operations,
+        decoding text labels.
+        """
+        keys = [self.column(name) for name in by]
+        causes = self.column('cause')
+
+        groups = {}
+        for start, stop in self._chunks():
+            mask = self._mask(tests, start, stop)
+            survived = causes[start:stop][mask] == completed
+            # Build dense group ids one key column at a time. Once there would be more
+            # possible ids than rows, they are renumbered with unique, so the bins never
+            # outnumber the rows even when grouping by several numeric columns.
+            rows = int(mask.sum())
+            group_ids = numpy.zeros(rows, dtype=numpy.int64)
+            group_values = []
+            size = 1
+            for name, values in zip(by, keys):
+                chunk_values = values[start:stop][mask]
+                if name in self.CATEGORIES:
+                    unique = numpy.array(self.LABELS[name], dtype=object)
+                    ids = chunk_values.astype(numpy.int64)
+                else:
+                    unique, ids = numpy.unique(chunk_values, return_inverse=True)
+                    ids = ids.reshape(-1)
+
+                group_ids = group_ids * len(unique) + ids
+                if size * len(unique) > max(rows, 1):
+                    pairs, group_ids = numpy.unique(group_ids, return_inverse=True)
+                    group_ids = group_ids.reshape(-1)
+                else:
+                    pairs = numpy.arange(size * len(unique))
+                previous, current = numpy.divmod(pairs, len(unique))
+                group_values = [column[previous] for column in group_values] + [unique[current]]
+                size = len(pairs)
+
+            totals = numpy.bincount(group_ids, minlength=size)
+            alive = numpy.bincount(group_ids, weights=survived, minlength=size)
+            present = numpy.flatnonzero(totals)
+            chunk_keys = zip(*(column[present].tolist() for column in group_values)) if group_values else [()]
+            chunk = dict(zip(chunk_keys, zip(totals[present].tolist(), alive[present].astype(numpy.int64).tolist())))
+
+            if not groups:
+                groups = chunk
+                continue
+            for key, (total, count) in chunk.items():
+                previous_total, previous_count = groups.get(key, (0, 0))
+                groups[key] = (previous_total + total, previous_count + count)
+        return groups
+
+    def _close_map(self, cached):
+        """
+        Closes a memory map, unless arrays or views returned by column still use it.
+        In that case the map is closed when the last of them is released.
+
+        :param cached: The mmap to close.
+        """
+        try:
+            cached.close()
+        except BufferError:
+            pass
+
+    def close(self):
+        """
+        Closes the column files. Arrays and views returned by column stay readable
+        until they are released.
+        """
+        for writer in self._writers.values():
+            writer.close()
+        for cached in self._maps.values():
+            self._close_map(cached)
+        self._maps = {}
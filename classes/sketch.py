@@ -0,0 +1,371 @@
+# classes/sketch.py
+
+import json
+import math
+import os
+import tempfile
+
+
+class QuantileSketch:
+    """
+    A fixed-memory quantile sketch that can be merged with others in any order.
+
+    Values are counted in logarithmic buckets, so every quantile is returned within
+    the relative accuracy of the true value. If the number of buckets passes the
+    limit, the buckets closest to zero are folded together, which only affects
+    the accuracy of quantiles near zero.
+    """
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        """
+        Initializes an empty sketch.
+
+        :param relative_accuracy: The largest relative error of a returned quantile.
+        :param max_buckets: The most buckets kept for positive and for negative values.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        """
+        Adds a value to the sketch.
+
+        :param value: The value to add.
+        """
+        self.count += 1
+        if value > 0:
+            self._add_to(self.positive, math.ceil(math.log(value) / self._log_gamma), 1)
+        elif value < 0:
+            self._add_to(self.negative, math.ceil(math.log(-value) / self._log_gamma), 1)
+        else:
+            self.zero_count += 1
+
+    def _add_to(self, buckets, key, count):
+        """
+        Adds a count to one bucket, folding the lowest buckets if there are too many.
+
+        :param buckets: The positive or negative bucket dictionary.
+        :param key: The bucket index.
+        :param count: How many values to add to the bucket.
+        """
+        buckets[key] = buckets.get(key, 0) + count
+        if len(buckets) > self.max_buckets:
+            # Fold the smallest magnitudes into the lowest bucket that is kept
+            keys = sorted(buckets)
+            folded = sum(buckets.pop(old) for old in keys[:len(keys) - self.max_buckets])
+            buckets[keys[-self.max_buckets]] += folded
+
+    def merge(self, other):
+        """
+        Adds the counts of another sketch with the same settings to this one.
+
+        Both the accuracy and the bucket limit must match, so the result and its error
+        bound are the same whatever order sketches are merged in.
+
+        :param other: The QuantileSketch to merge in.
+        """
+        if (other.relative_accuracy, other.max_buckets) != (self.relative_accuracy, self.max_buckets):
+            raise ValueError("Only sketches with the same relative accuracy and bucket limit can be merged.")
+        for key, count in other.positive.items():
+            self._add_to(self.positive, key, count)
+        for key, count in other.negative.items():
+            self._add_to(self.negative, key, count)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _value(self, key):
+        """
+        Returns the value a bucket represents, in the middle of its range.
+
+        :param key: The bucket index.
+        """
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """
+        Estimates a quantile of the values added.
+
+        :param q: The quantile, between 0 and 1.
+        :return: The estimated value, or None if the sketch is empty.
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+    def to_dict(self):
+        """
+        Returns the sketch as a dictionary that can be saved as JSON.
+        """
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'positive': {str(key): count for key, count in self.positive.items()},
+            'negative': {str(key): count for key, count in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a sketch saved with to_dict.
+        """
+        sketch = cls(data['relative_accuracy'], data['max_buckets'])
+        sketch.positive = {int(key): count for key, count in data['positive'].items()}
+        sketch.negative = {int(key): count for key, count in data['negative'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        return sketch
+
+
+class Histogram:
+    """
+    Exact counts over a small set of labels, such as the branches an event can take.
+    """
+    def __init__(self, counts=None):
+        """
+        Initializes the histogram.
+
+        :param counts: A dictionary of starting counts for each label.
+        """
+        self.counts = dict(counts) if counts else {}
+
+    def add(self, label, count=1):
+        """
+        Counts a label.
+
+        :param label: The label to count.
+        :param count: How many times to count it.
+        """
+        self.counts[label] = self.counts.get(label, 0) + count
+
+    def merge(self, other):
+        """
+        Adds the counts of another histogram to this one.
+
+        :param other: The Histogram to merge in.
+        """
+        for label, count in other.counts.items():
+            self.add(label, count)
+
+    def to_dict(self):
+        """
+        Returns the histogram as a dictionary that can be saved as JSON.
+        """
+        return dict(self.counts)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a histogram saved with to_dict.
+        """
+        return cls(data)
+
+
+class OutcomeStats:
+    """
+    Collects mergeable outcome statistics over many games.
+
+    Final resources and rounds survived are sketched per role, resource changes
+    are sketched per event type, and event branches are counted exactly.
+    """
+    METRICS = ['food', 'ammo', 'health', 'rounds']
+    RESOURCES = ['food', 'ammo', 'health']
+
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Initializes empty statistics.
+
+        :param relative_accuracy: The relative accuracy of every quantile sketch.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.final = {}
+        self.deltas = {}
+        self.branches = Histogram()
+        self.outcomes = Histogram()
+
+    def _sketches(self, table, name, fields):
+        """
+        Returns the sketches for a role or event type, creating them if needed.
+
+        :param table: The dictionary of sketches, either final or deltas.
+        :param name: The role or event type.
+        :param fields: The metrics to sketch for it.
+        """
+        if name not in table:
+            table[name] = {field: QuantileSketch(self.relative_accuracy) for field in fields}
+        return table[name]
+
+    def update_event(self, event_type, branch, deltas):
+        """
+        Records the result of one event.
+
+        :param event_type: The type of event processed.
+        :param branch: The outcome the event recorded in last_outcome.
+        :param deltas: A dictionary of the change in food, ammo and health.
+        """
+        self.branches.add(f'{event_type}:{branch}')
+        sketches = self._sketches(self.deltas, event_type, self.RESOURCES)
+        for resource in self.RESOURCES:
+            sketches[resource].add(deltas[resource])
+
+    def update_game(self, game):
+        """
+        Records the final state of a game that has ended.
+
+        :param game: The Game instance that has ended.
+        """
+        resources = game.character.resources
+        sketches = self._sketches(self.final, game.character.role, self.METRICS)
+        sketches['food'].add(resources.food)
+        sketches['ammo'].add(resources.ammo)
+        sketches['health'].add(resources.health)
+        sketches['rounds'].add(game.event_count)
+        self.outcomes.add(f'{game.character.role}:{game.outcome()}')
+
+    def merge(self, other):
+        """
+        Adds the statistics collected by another worker to these.
+
+        :param other: The OutcomeStats to merge in.
+        """
+        for table, other_table, fields in ((self.final, other.final, self.METRICS),
+                                           (self.deltas, other.deltas, self.RESOURCES)):
+            for name, sketches in other_table.items():
+                mine = self._sketches(table, name, fields)
+                for field, sketch in sketches.items():
+                    mine[field].merge(sketch)
+        self.branches.merge(other.branches)
+        self.outcomes.merge(other.outcomes)
+
+    def percentiles(self, role, metric, percents=(5, 50, 95)):
+        """
+        Estimates percentiles of a final metric for one role.
+
+        :param role: The character role.
+        :param metric: One of food, ammo, health or rounds.
+        :param percents: The percentiles to estimate.
+        :return: A dictionary mapping each percentile to its estimate.
+        """
+        sketch = self.final.get(role, {}).get(metric)
+        return {p: sketch.quantile(p / 100) if sketch else None for p in percents}
+
+    def report(self, percents=(5, 50, 95)):
+        """
+        Prints percentiles of every final metric for each role.
+
+        :param percents: The percentiles to show.
+        """
+        print("\nOutcome Percentiles")
+        print(f"{'='*30}")
+        for role in sorted(self.final):
+            print(f"{role} ({self.final[role]['rounds'].count} games)")
+            for metric in self.METRICS:
+                values = self.percentiles(role, metric, percents)
+                shown = ', '.join(f"p{p}={value:.1f}" for p, value in values.items())
+                print(f"  {metric:<8}: {shown}")
+        print(f"{'='*30}")
+
+    def to_dict(self):
+        """
+        Returns the statistics as a dictionary that can be saved as JSON.
+        """
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'final': {name: {field: sketch.to_dict() for field, sketch in sketches.items()}
+                      for name, sketches in self.final.items()},
+            'deltas': {name: {field: sketch.to_dict() for field, sketch in sketches.items()}
+                       for name, sketches in self.deltas.items()},
+            'branches': self.branches.to_dict(),
+            'outcomes': self.outcomes.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds statistics saved with to_dict.
+        """
+        stats = cls(data['relative_accuracy'])
+        stats.final = {name: {field: QuantileSketch.from_dict(sketch) for field, sketch in sketches.items()}
+                       for name, sketches in data['final'].items()}
+        stats.deltas = {name: {field: QuantileSketch.from_dict(sketch) for field, sketch in sketches.items()}
+                        for name, sketches in data['deltas'].items()}
+        stats.branches = Histogram.from_dict(data['branches'])
+        stats.outcomes = Histogram.from_dict(data['outcomes'])
+        return stats
+
+    def save(self, path):
+        """
+        Saves the statistics to a JSON file.
+
+        The file is written under a temporary name and then moved into place, so an
+        interrupted save never leaves a truncated file behind.
+
+        :param path: The file to write.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as file:
+            temp_path = file.name
+            try:
+                json.dump(self.to_dict(), file)
+            except BaseException:
+                file.close()
+                os.remove(temp_path)
+                raise
+
+        # Temporary files are private to their owner; give the result the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads statistics saved with save.
+
+        :param path: The file to read.
+        """
+        with open(path, 'r') as file:
+            return cls.from_dict(json.load(file))
+
+    @classmethod
+    def merge_files(cls, paths):
+        """
+        Merges statistics saved by separate workers.
+
+        :param paths: JSON files written by save, or directories holding them.
+        :return: The merged OutcomeStats.
+        """
+        merged = None
+        for path in paths:
+            if os.path.isdir(path):
+                files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.json'))
+            else:
+                files = [path]
+            for file in files:
+                stats = cls.load(file)
+                if merged is None:
+                    merged = stats
+                else:
+                    merged.merge(stats)
+        return merged if merged is not None else cls()
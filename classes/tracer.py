@@ -0,0 +1,109 @@
+# classes/tracer.py
+
+import collections
+import json
+import logging
+import logging.handlers
+import random
+import time
+import uuid
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    Records structured spans for game sessions.
+
+    Finished spans are kept in a ring buffer of the last few spans. Spans whose
+    root was sampled are also written as JSON lines to a size-rotated file.
+    """
+    def __init__(self, path, sample_rate=1.0, ring_size=100, max_bytes=1_000_000, backup_count=3):
+        """
+        Initializes a tracer writing to a rotating JSON-lines file.
+
+        :param path: The file spans are written to.
+        :param sample_rate: The fraction of root spans (and their children) to write to the file.
+        :param ring_size: The number of recent spans kept in memory for dumping on game over.
+        :param max_bytes: The size at which the trace file is rotated.
+        :param backup_count: The number of rotated trace files to keep.
+        """
+        self.sample_rate = sample_rate
+        self.ring = collections.deque(maxlen=ring_size)
+        self._stack = []
+        # A private generator so sampling does not disturb the game's random sequence
+        self._random = random.Random()
+
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._logger = logging.getLogger(f'{__name__}.{uuid.uuid4().hex}')
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(handler)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Times a block of code and records it as a span.
+
+        The sampling decision is made once for each root span and is inherited by
+        every span opened inside it.
+
+        :param name: The name of the span.
+        :param attributes: Initial attributes for the span.
+        :return: The span's attribute dictionary, which the block may add to.
+        """
+        if self._stack:
+            parent = self._stack[-1]
+            trace_id, parent_id, sampled = parent['trace_id'], parent['span_id'], parent['sampled']
+        else:
+            trace_id, parent_id = uuid.uuid4().hex, None
+            sampled = self._random.random() < self.sample_rate
+
+        record = {
+            'name': name,
+            'trace_id': trace_id,
+            'span_id': uuid.uuid4().hex[:16],
+            'parent_id': parent_id,
+            'sampled': sampled,
+            'start': time.time(),
+            'attributes': dict(attributes),
+        }
+        self._stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record['attributes']
+        finally:
+            record['duration_ms'] = (time.perf_counter() - started) * 1000
+            self._stack.pop()
+            self.ring.append(record)
+            if sampled:
+                self._write(record)
+
+    def dump_ring(self, reason):
+        """
+        Writes the spans held in the ring buffer, and the spans still open, that were
+        not sampled. Sampled spans are already in the trace file, or will be once they close.
+
+        :param reason: Why the ring buffer is being dumped, such as 'game_over'.
+        """
+        for record in self.ring:
+            if not record['sampled']:
+                self._write(dict(record, dump=reason))
+        for record in self._stack:
+            if not record['sampled']:
+                self._write(dict(record, dump=reason, open=True))
+        self.ring.clear()
+
+    def close(self):
+        """
+        Closes the trace file.
+        """
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+            handler.close()
+
+    def _write(self, record):
+        """
+        Writes one span to the trace file as a JSON line.
+        """
+        self._logger.info(json.dumps(record, default=str))
@@ -1,6 +1,14 @@
 #classes/main.py
 
+import argparse
+import os
+
 from classes.game import Game
+from classes.policy import POLICIES
+from classes.profiler import Profiler
+from classes.results import ResultStore
+from classes.sketch import OutcomeStats
+from classes.tracer import Tracer
 
 def display_menu():
     """
@@ -13,6 +21,7 @@ def display_menu():
     print("4. Save Game")
     print("5. Restart Game")
     print("6. Exit")
+    print("7. Auto-Play Rounds")
     print("============================")
 
 def display_character(character):
@@ -43,38 +52,211 @@ def display_resources(resources):
     else:
         print("\nNo resources initialized yet.")
 
+def handle_choice(game, choice):
+    """
+    Performs the menu action for the player's choice.
+
+    :param game: The running Game instance.
+    :param choice: The menu option entered by the player.
+    :return: False if the player chose to exit, True otherwise.
+    """
+    if choice == '1':
+        game.show_character()
+    elif choice == '2':
+        game.show_resources()
+    elif choice == '3':
+        game.apply_random_event()
+    elif choice == '4':
+        game.save_state()
+    elif choice == '5':
+        game.restart()
+    elif choice == '6':
+        print("Thank you for playing Red Trail Redemption!")
+        return False
+    elif choice == '7':
+        auto_play(game)
+    else:
+        print("Invalid choice. Please choose a valid option.")
+    return True
+
+def parse_rounds(text):
+    """
+    Converts a number of rounds to auto-play, where 'all' means play until the game ends.
+
+    :param text: The number of rounds or 'all'.
+    :return: The number of rounds, or None for all of them.
+    """
+    if text.strip().lower() == 'all':
+        return None
+    rounds = int(text)
+    if rounds < 1:
+        raise ValueError("The number of rounds must be at least 1.")
+    return rounds
+
+def auto_play(game):
+    """
+    Asks how many rounds to auto-play and with which policy, then plays them.
+
+    :param game: The running Game instance.
+    """
+    try:
+        rounds = parse_rounds(input("How many rounds to auto-play? (number or 'all'): "))
+    except ValueError:
+        print("Invalid number of rounds.")
+        return
+
+    names = '/'.join(POLICIES)
+    policy = input(f"Choose a policy ({names}) [cautious]: ").strip().lower() or 'cautious'
+    if policy not in POLICIES:
+        print("Unknown policy.")
+        return
+
+    game.auto_play(rounds, policy)
+
+def parse_args():
+    """
+    Parses the command line options.
+    """
+    parser = argparse.ArgumentParser(description="Red Trail Redemption")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="write structured trace spans as JSON lines to PATH")
+    parser.add_argument('--trace-sample', type=float, default=1.0, metavar='RATE',
+                        help="fraction of menu actions to trace (default: 1.0)")
+    parser.add_argument('--trace-ring', type=int, default=100, metavar='N',
+                        help="number of recent spans dumped when the game is over (default: 100)")
+    parser.add_argument('--profile', nargs='?', const='profile.folded', metavar='PATH',
+                        help="profile the game modules and write collapsed stacks to PATH "
+                             "(default: profile.folded)")
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                        help="number of functions shown in the hotspot table (default: 10)")
+    parser.add_argument('--stats', metavar='DIR',
+                        help="collect outcome statistics and save them to a new JSON file in DIR")
+    parser.add_argument('--merge-stats', nargs='+', metavar='PATH',
+                        help="merge statistics files, or directories of them, print the report and exit")
+    parser.add_argument('--merge-output', metavar='FILE',
+                        help="with --merge-stats, also save the merged statistics to FILE")
+    parser.add_argument('--auto-play', type=parse_rounds, default=False, metavar='N',
+                        help="after the game starts, auto-play N rounds, or 'all' to play to the end")
+    parser.add_argument('--policy', choices=list(POLICIES), default='cautious',
+                        help="decision policy used when auto-playing (default: cautious)")
+    parser.add_argument('--seed', type=int,
+                        help="seed the random events so a game can be reproduced")
+    parser.add_argument('--results', metavar='DIR',
+                        help="append each finished game to the columnar result store in DIR")
+    return parser.parse_args()
+
 def main():
     """
     Main function to start and run the game.
     """
-    game = Game()
-    
-    # Optionally, load a previously saved game state
-    game.load_state()
-
-    # Start the game
-    game.start_game()
-
-    # Main game loop
-    while True:
-        display_menu()
-        choice = input("Choose an option (1-6): ")
-
-        if choice == '1':
-            game.show_character()
-        elif choice == '2':
-            game.show_resources()
-        elif choice == '3':
-            game.apply_random_event()
-        elif choice == '4':
-            game.save_state()
-        elif choice == '5':
-            game.restart()
-        elif choice == '6':
-            print("Thank you for playing Red Trail Redemption!")
-            break
-        else:
-            print("Invalid choice. Please choose a valid option.")
+    args = parse_args()
+    if args.merge_stats:
+        merge_stats(args.merge_stats, args.merge_output)
+        return
+
+    if not args.profile:
+        play(args)
+        return
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        play(args)
+    finally:
+        profiler.stop()
+        profiler.write_collapsed(args.profile)
+        profiler.print_hotspots(args.profile_top)
+        print(f"Profile written to {args.profile}")
+
+def play(args):
+    """
+    Creates the game and runs the main menu loop.
+
+    :param args: The parsed command line options.
+    """
+    tracer = None
+    if args.trace:
+        tracer = Tracer(args.trace, sample_rate=args.trace_sample, ring_size=args.trace_ring)
+
+    stats = OutcomeStats() if args.stats else None
+    results = ResultStore(args.results) if args.results else None
+
+    game = Game(tracer=tracer, stats=stats, results=results, seed=args.seed)
+    seed = game.seed
+
+    # Everything after setup runs inside the try, so the files are saved and closed
+    # even when the game ends through exit()
+    try:
+        # Optionally, load a previously saved game state
+        game.load_state()
+
+        # Start the game
+        game.start_game()
+
+        # Optionally, fast-forward before handing over to the menu
+        if args.auto_play is not False:
+            run_action(tracer, '--auto-play', game.auto_play, args.auto_play, args.policy)
+
+        # Main game loop
+        while True:
+            display_menu()
+            choice = input("Choose an option (1-7): ")
+
+            running = run_action(tracer, choice, handle_choice, game, choice)
+
+            if not running:
+                break
+    finally:
+        if tracer is not None:
+            tracer.close()
+        if results is not None:
+            results.close()
+        if stats is not None:
+            save_stats(stats, args.stats, seed)
+
+def run_action(tracer, choice, action, *args):
+    """
+    Runs a menu action, inside a menu_action span when tracing.
+
+    :param tracer: The session's Tracer, or None.
+    :param choice: The menu option or command line flag that started the action.
+    :param action: The function to call.
+    :param args: The arguments to pass to action.
+    :return: What action returns.
+    """
+    if tracer is None:
+        return action(*args)
+    with tracer.span('menu_action', choice=choice):
+        return action(*args)
+
+def save_stats(stats, directory, seed):
+    """
+    Saves the statistics from this run to their own file in directory and reports them.
+
+    Each run writes a separate file so that concurrent runs never overwrite each
+    other; use --merge-stats to combine them.
+
+    :param stats: The OutcomeStats collected during this run.
+    :param directory: The directory holding the statistics of every run.
+    :param seed: The random seed of this run, used in the file name.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"stats-{seed}-{os.getpid()}.json")
+    stats.save(path)
+    stats.report()
+    print(f"Statistics written to {path}")
+
+def merge_stats(paths, output=None):
+    """
+    Merges statistics saved by earlier runs and reports the combined percentiles.
+
+    :param paths: Statistics files, or directories holding them.
+    :param output: An optional file to save the merged statistics to.
+    """
+    merged = OutcomeStats.merge_files(paths)
+    if output is not None:
+        merged.save(output)
+    merged.report()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()